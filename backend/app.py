@@ -5,13 +5,20 @@ Professional-grade web application for electrical component classification.
 
 import os
 import logging
+import secrets
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
 from flask import Flask, request, jsonify, render_template, redirect, url_for, flash
+from waitress import serve
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
-import uuid
+from streaming_form_data import StreamingFormDataParser
+from streaming_form_data.parser import ParseFailedException
+from streaming_form_data.targets import ValueTarget
 
-from dep import create_predictor
+from dep import batch_buckets, create_predictor, DynamicBatcher
 
 # Configure logging
 logging.basicConfig(
@@ -24,54 +31,145 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'electrical-component-classifier-2025'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['MAX_BATCH_SIZE'] = 32  # Max images per forward pass
+app.config['MAX_LATENCY'] = 0.02  # Max seconds a request waits for a batch to fill
+app.config['PREPROCESS_WORKERS'] = 4  # Threads decoding uploads alongside inference
+app.config['PREDICT_TIMEOUT'] = 30  # Seconds before a queued prediction is abandoned
+app.config['SAVE_UPLOADS'] = False  # Keep a copy of each upload on disk for debugging
+app.config['CLEANUP_INTERVAL'] = 600  # Seconds between sweeps of the upload folder
+app.config['SERVER_THREADS'] = min(8, os.cpu_count() or 1)  # Waitress worker threads
+app.config['SERVER_CONNECTION_LIMIT'] = 200  # Max simultaneous connections
+app.config['SERVER_CHANNEL_TIMEOUT'] = 60  # Seconds before an idle connection is closed
 
 # Configuration
 UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'static', 'uploads')
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'bmp', 'tiff', 'webp'}
+UPLOAD_CHUNK_SIZE = 64 * 1024  # Bytes read from the request stream per iteration
+MULTIPART_OVERHEAD = 64 * 1024  # Allowance for multipart headers and boundaries around the file
 
 # Ensure upload directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Initialize predictor (lazy loading)
+# Predictor is created once at import time so no request pays the load cost
 predictor = None
+batcher = None
+_predictor_lock = threading.Lock()
 
-def get_predictor():
-    """Get or create predictor instance (singleton pattern)."""
-    global predictor
+def init_predictor():
+    """Create and warm up the predictor and its batcher (singleton pattern)."""
+    global predictor, batcher
+    with _predictor_lock:
+        if predictor is None:
+            try:
+                predictor = create_predictor()
+                # Warm exactly the padded batch sizes the batcher can produce
+                predictor.warmup(batch_buckets(app.config['MAX_BATCH_SIZE']))
+                batcher = DynamicBatcher(
+                    predictor,
+                    max_batch_size=app.config['MAX_BATCH_SIZE'],
+                    max_latency=app.config['MAX_LATENCY'],
+                    preprocess_workers=app.config['PREPROCESS_WORKERS']
+                )
+                logger.info("Predictor initialized successfully")
+            except Exception as e:
+                logger.error(f"Failed to initialize predictor: {str(e)}")
+                logger.error("Please ensure model files are in the correct location")
+    return predictor
+
+def require_predictor():
+    """Return the loaded predictor or raise if initialization failed."""
     if predictor is None:
-        try:
-            predictor = create_predictor()
-            logger.info("Predictor initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize predictor: {str(e)}")
-            raise
+        raise RuntimeError("Model not loaded")
     return predictor
 
+init_predictor()
+
 def allowed_file(filename):
     """Check if file extension is allowed."""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def validate_upload(filename):
+    """Return an error message for an unusable upload filename, or None if it is valid."""
+    # Check if file was uploaded
+    if filename is None:
+        return 'No file uploaded'
+    
+    # Check if file was selected
+    if filename == '':
+        return 'No file selected'
+    
+    if not allowed_file(filename):
+        return f'Invalid file type. Allowed types: {", ".join(ALLOWED_EXTENSIONS)}'
+    
+    return None
+
+def too_large_message():
+    """Error message for uploads over MAX_CONTENT_LENGTH."""
+    limit = app.config['MAX_CONTENT_LENGTH']
+    if limit >= 1024 * 1024:
+        size = f"{limit / (1024 * 1024):g}MB"
+    else:
+        size = f"{limit / 1024:g}KB"
+    return f"File too large. Maximum size is {size}."
+
+def wants_all_probabilities(value):
+    """Interpret the all_probabilities query parameter."""
+    return (value or '').lower() in ('1', 'true', 'yes')
+
+def finalize_result(result, filename, data, include_all_probabilities=False):
+    """
+    Attach file info to a prediction result for the response.
+    
+    Naming and sanitizing only feed the response, so they run after prediction.
+    The upload is written to disk here when SAVE_UPLOADS is enabled.
+    """
+    if not include_all_probabilities:
+        result.pop('all_probabilities', None)
+    
+    file_extension = filename.rsplit('.', 1)[1].lower()
+    unique_filename = f"{secrets.token_hex(8)}.{file_extension}"
+    
+    # Optionally keep a copy on disk for debugging
+    if app.config['SAVE_UPLOADS']:
+        with open(os.path.join(UPLOAD_FOLDER, unique_filename), 'wb') as f:
+            f.write(data)
+        logger.info(f"File saved: {unique_filename}")
+    
+    # Add file info to result
+    result['filename'] = unique_filename
+    result['original_filename'] = secure_filename(filename)
+    return result
+
 def cleanup_old_files():
     """Clean up files older than 1 hour to manage storage."""
     try:
-        current_time = datetime.now().timestamp()
-        for filename in os.listdir(UPLOAD_FOLDER):
-            file_path = os.path.join(UPLOAD_FOLDER, filename)
-            if os.path.isfile(file_path):
-                file_age = current_time - os.path.getmtime(file_path)
-                if file_age > 3600:  # 1 hour
-                    os.remove(file_path)
-                    logger.info(f"Cleaned up old file: {filename}")
+        current_time = time.time()
+        # DirEntry caches the file type from the directory read, so only stat() hits the disk
+        with os.scandir(UPLOAD_FOLDER) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    file_age = current_time - entry.stat().st_mtime
+                    if file_age > 3600:  # 1 hour
+                        os.unlink(entry.path)
+                        logger.info(f"Cleaned up old file: {entry.name}")
     except Exception as e:
         logger.warning(f"Error during cleanup: {str(e)}")
 
+def cleanup_worker():
+    """Periodically remove old uploads, off the request path."""
+    while True:
+        time.sleep(app.config['CLEANUP_INTERVAL'])
+        cleanup_old_files()
+
+threading.Thread(target=cleanup_worker, name="upload-cleanup", daemon=True).start()
+
 @app.route('/')
 def index():
     """Serve the main application page."""
     try:
         # Get class information for display
-        predictor = get_predictor()
+        predictor = require_predictor()
         class_info = predictor.get_class_info()
         
         return render_template('index.html', 
@@ -99,67 +197,61 @@ def predict():
     """
     Handle image upload and prediction.
     
+    The multipart body is parsed incrementally and the file part is kept in
+    memory; it is only written to the uploads folder when SAVE_UPLOADS is set.
+    Waitress has already buffered the body (in a temporary file above 512KB)
+    before this runs, so incremental parsing only saves upload-phase work
+    under a server that streams request bodies to the app.
+    The full class distribution is only included with ?all_probabilities=true.
+    
     Returns:
         JSON response with prediction results
     """
     try:
-        # Check if file was uploaded
-        if 'file' not in request.files:
-            return jsonify({
-                'success': False,
-                'error': 'No file uploaded'
-            }), 400
-        
-        file = request.files['file']
+        # request.stream enforces MAX_CONTENT_LENGTH, so the file part needs no limit of its own
+        target = ValueTarget()
+        parser = StreamingFormDataParser(headers=request.headers)
+        parser.register('file', target)
         
-        # Check if file was selected
-        if file.filename == '':
-            return jsonify({
-                'success': False,
-                'error': 'No file selected'
-            }), 400
+        while True:
+            chunk = request.stream.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            parser.data_received(chunk)
         
         # Validate file
-        if not allowed_file(file.filename):
+        filename = target.multipart_filename
+        error = validate_upload(filename)
+        if error is not None:
             return jsonify({
                 'success': False,
-                'error': f'Invalid file type. Allowed types: {", ".join(ALLOWED_EXTENSIONS)}'
+                'error': error
             }), 400
         
-        # Generate unique filename
-        file_extension = file.filename.rsplit('.', 1)[1].lower()
-        unique_filename = f"{uuid.uuid4()}.{file_extension}"
-        file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-        
-        # Save file
-        file.save(file_path)
-        logger.info(f"File saved: {unique_filename}")
-        
-        # Clean up old files
-        cleanup_old_files()
+        # Make prediction (cached by content, batched with concurrent requests)
+        data = target.value
+        require_predictor()
+        result = batcher.predict_bytes(data, timeout=app.config['PREDICT_TIMEOUT'])
         
-        # Make prediction
-        predictor = get_predictor()
-        result = predictor.predict(file_path)
+        return jsonify(finalize_result(result, filename, data,
+                                       wants_all_probabilities(request.args.get('all_probabilities'))))
         
-        # Add file info to result
-        result['filename'] = unique_filename
-        result['original_filename'] = secure_filename(file.filename)
-        
-        # Clean up uploaded file after prediction
-        try:
-            os.remove(file_path)
-            logger.info(f"Cleaned up uploaded file: {unique_filename}")
-        except Exception as e:
-            logger.warning(f"Failed to clean up file {unique_filename}: {str(e)}")
-        
-        return jsonify(result)
-        
-    except RequestEntityTooLarge:
+    except ParseFailedException:
         return jsonify({
             'success': False,
-            'error': 'File too large. Maximum size is 16MB.'
-        }), 413
+            'error': 'Malformed upload. Expected multipart/form-data.'
+        }), 400
+    
+    except FutureTimeoutError:
+        logger.error("Prediction timed out waiting for the model")
+        return jsonify({
+            'success': False,
+            'error': 'Prediction timed out. Please try again.'
+        }), 503
+    
+    except RequestEntityTooLarge:
+        # Raised by request.stream from Content-Length, or once a chunked body passes the limit
+        raise
     
     except Exception as e:
         logger.error(f"Error in predict endpoint: {str(e)}")
@@ -172,13 +264,14 @@ def predict():
 def health():
     """Health check endpoint."""
     try:
-        predictor = get_predictor()
+        predictor = require_predictor()
         class_info = predictor.get_class_info()
         
         return jsonify({
             'status': 'healthy',
             'model_loaded': True,
             'num_classes': class_info['num_classes'],
+            'cache': predictor.get_cache_stats(),
             'timestamp': datetime.now().isoformat()
         })
     except Exception as e:
@@ -193,7 +286,7 @@ def health():
 def get_classes():
     """Get available classes information."""
     try:
-        predictor = get_predictor()
+        predictor = require_predictor()
         class_info = predictor.get_class_info()
         
         return jsonify({
@@ -214,7 +307,7 @@ def too_large(e):
     """Handle file too large error."""
     return jsonify({
         'success': False,
-        'error': 'File too large. Maximum size is 16MB.'
+        'error': too_large_message()
     }), 413
 
 @app.errorhandler(404)
@@ -234,25 +327,39 @@ def internal_error(e):
         'error': 'Internal server error'
     }), 500
 
+def run_server(host='127.0.0.1', port=5000):
+    """
+    Serve the application with Waitress.
+    
+    Request threads mostly wait on the dynamic batcher, so the pool is sized
+    to the CPU count rather than one thread per GPU. Waitress receives each
+    body in full before the app sees it, so its own body limit is set from
+    MAX_CONTENT_LENGTH to stop oversized uploads while they are received.
+    
+    Args:
+        host (str): Interface to bind to
+        port (int): Port to listen on
+    """
+    serve(
+        app,
+        host=host,
+        port=port,
+        threads=app.config['SERVER_THREADS'],
+        connection_limit=app.config['SERVER_CONNECTION_LIMIT'],
+        channel_timeout=app.config['SERVER_CHANNEL_TIMEOUT'],
+        max_request_body_size=app.config['MAX_CONTENT_LENGTH'] + MULTIPART_OVERHEAD
+    )
+
 if __name__ == '__main__':
-    # Development server configuration
+    # Server configuration
     logger.info("Starting Electrical Component Classification App")
     logger.info(f"Upload folder: {UPLOAD_FOLDER}")
     logger.info(f"Allowed extensions: {ALLOWED_EXTENSIONS}")
     
-    # Test predictor initialization
-    try:
-        predictor = get_predictor()
+    # Report predictor initialization (performed at import time)
+    if predictor is not None:
         class_info = predictor.get_class_info()
         logger.info(f"Model loaded with {class_info['num_classes']} classes")
-    except Exception as e:
-        logger.error(f"Failed to initialize predictor: {str(e)}")
-        logger.error("Please ensure model files are in the correct location")
     
     # Run the application
-    app.run(
-        host='127.0.0.1',
-        port=5000,
-        debug=False,
-        threaded=True
-    )
+    run_server(host='127.0.0.1', port=5000)
@@ -0,0 +1,172 @@
+"""
+Electrical Component Classification - ASGI Application
+Async front end for the prediction API, sharing the Flask app's predictor and batcher.
+
+Serve with:
+    uvicorn asgi:app --workers 1 --http httptools --loop uvloop
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+
+from a2wsgi import WSGIMiddleware
+from fastapi import FastAPI, File, HTTPException, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+import app as flask_module
+from app import finalize_result, require_predictor, too_large_message, validate_upload, wants_all_probabilities
+
+logger = logging.getLogger(__name__)
+
+flask_app = flask_module.app
+
+app = FastAPI(title="Electrical Component Classifier", docs_url=None, redoc_url=None)
+
+class UploadTooLarge(HTTPException):
+    """Raised while receiving a /predict body that exceeds MAX_CONTENT_LENGTH."""
+    
+    def __init__(self):
+        super().__init__(status_code=413)
+
+class UploadSizeLimitMiddleware:
+    """
+    Enforce MAX_CONTENT_LENGTH on /predict while the body is received.
+    
+    Requests with a Content-Length over the limit are rejected before any
+    of the body is read; bodies without one (chunked uploads) are counted
+    as they arrive and aborted as soon as they pass the limit, so an
+    oversized upload is never spooled in full. Both cases raise
+    UploadTooLarge, so upload_too_large() builds every 413 response.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] != '/predict':
+            await self.app(scope, receive, send)
+            return
+        
+        limit = flask_app.config['MAX_CONTENT_LENGTH']
+        headers = dict(scope['headers'])
+        try:
+            content_length = int(headers.get(b'content-length') or 0)
+        except ValueError:
+            content_length = 0
+        
+        received = 0
+        
+        async def limited_receive():
+            nonlocal received
+            if content_length > limit:
+                raise UploadTooLarge()
+            message = await receive()
+            if message['type'] == 'http.request':
+                received += len(message.get('body', b''))
+                if received > limit:
+                    raise UploadTooLarge()
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
+app.add_middleware(UploadSizeLimitMiddleware)
+
+@app.exception_handler(UploadTooLarge)
+async def upload_too_large(request: Request, exc: UploadTooLarge):
+    """Handle file too large error, with the same body as the Flask app."""
+    return JSONResponse({
+        'success': False,
+        'error': too_large_message()
+    }, status_code=413)
+
+@app.post('/predict')
+async def predict(request: Request, file: Optional[UploadFile] = File(None)):
+    """
+    Handle image upload and prediction without holding a thread per request.
+    
+    Returns:
+        JSON response with prediction results
+    """
+    try:
+        # Validate file
+        filename = file.filename if file is not None else None
+        error = validate_upload(filename)
+        if error is not None:
+            return JSONResponse({
+                'success': False,
+                'error': error
+            }, status_code=400)
+        
+        # UploadSizeLimitMiddleware has already bounded the body to MAX_CONTENT_LENGTH
+        data = await file.read()
+        
+        # Make prediction (cached by content, batched with concurrent requests)
+        require_predictor()
+        result = await flask_module.batcher.predict_bytes_async(data,
+                                                                timeout=flask_app.config['PREDICT_TIMEOUT'])
+        
+        # May write the upload to disk (SAVE_UPLOADS), so keep it off the event loop
+        return await run_in_threadpool(finalize_result, result, filename, data,
+                                       wants_all_probabilities(request.query_params.get('all_probabilities')))
+    
+    except asyncio.TimeoutError:
+        logger.error("Prediction timed out waiting for the model")
+        return JSONResponse({
+            'success': False,
+            'error': 'Prediction timed out. Please try again.'
+        }, status_code=503)
+    
+    except Exception as e:
+        logger.error(f"Error in predict endpoint: {str(e)}")
+        return JSONResponse({
+            'success': False,
+            'error': 'Internal server error. Please try again.'
+        }, status_code=500)
+
+@app.get('/health')
+async def health():
+    """Health check endpoint."""
+    try:
+        predictor = require_predictor()
+        class_info = predictor.get_class_info()
+        
+        return {
+            'status': 'healthy',
+            'model_loaded': True,
+            'num_classes': class_info['num_classes'],
+            'cache': predictor.get_cache_stats(),
+            'timestamp': datetime.now().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Health check failed: {str(e)}")
+        return JSONResponse({
+            'status': 'unhealthy',
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }, status_code=500)
+
+@app.get('/classes')
+async def get_classes():
+    """Get available classes information."""
+    try:
+        predictor = require_predictor()
+        class_info = predictor.get_class_info()
+        
+        return {
+            'success': True,
+            'num_classes': class_info['num_classes'],
+            'classes': class_info['classes'],
+            'class_mapping': class_info['class_mapping']
+        }
+    except Exception as e:
+        logger.error(f"Error getting classes: {str(e)}")
+        return JSONResponse({
+            'success': False,
+            'error': str(e)
+        }, status_code=500)
+
+# Pages, static files and error handlers are still served by the Flask app
+app.mount('/', WSGIMiddleware(flask_app))
@@ -3,19 +3,63 @@ Electrical Component Classification - Prediction Module
 Professional-grade prediction logic for electrical component classification.
 """
 
+import numpy as np
 import torch
 import torch.nn as nn
-from torchvision import transforms, models
+from torchvision import models
+from torchvision.io import ImageReadMode, decode_image, decode_jpeg
+from torchvision.transforms import v2
 from PIL import Image
+import asyncio
+import hashlib
+import io
 import json
 import os
 import logging
-from typing import Tuple, Optional, Dict, Any
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Tuple, Optional, Dict, Any, List
+
+try:
+    import cv2  # Optional: SIMD decode + resize on uint8 arrays
+except ImportError:
+    cv2 = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Default maximum number of images per forward pass
+MAX_BATCH_SIZE = 32
+
+# Model input size and ImageNet normalization statistics
+INPUT_SIZE = (128, 256)  # (height, width)
+NORMALIZE_MEAN = [0.485, 0.456, 0.406]
+NORMALIZE_STD = [0.229, 0.224, 0.225]
+
+def batch_buckets(max_batch_size: int = MAX_BATCH_SIZE) -> Tuple[int, ...]:
+    """
+    Batch sizes to warm up when shapes must stay fixed (compiled graphs,
+    cuDNN benchmark autotuning); live batches are padded up to the next one.
+    
+    Args:
+        max_batch_size (int): Largest batch the batcher will send
+        
+    Returns:
+        Tuple[int, ...]: Powers of two below max_batch_size, then max_batch_size itself
+    """
+    buckets = []
+    size = 1
+    while size < max_batch_size:
+        buckets.append(size)
+        size *= 2
+    buckets.append(max_batch_size)
+    return tuple(buckets)
+
 class ElectricalComponentPredictor:
     """
     Professional-grade electrical component classifier.
@@ -24,7 +68,9 @@ class ElectricalComponentPredictor:
     for electrical component classification using a pre-trained ResNet50 model.
     """
     
-    def __init__(self, model_path: str, class_map_path: str, device: str = None):
+    def __init__(self, model_path: str, class_map_path: str, device: str = None,
+                 use_int8: bool = False, use_compile: bool = False, cache_size: int = 1024,
+                 staging_buffers: int = 8):
         """
         Initialize the predictor with model and class mapping.
         
@@ -32,17 +78,43 @@ class ElectricalComponentPredictor:
             model_path (str): Path to the trained model weights
             class_map_path (str): Path to the class mapping JSON file
             device (str, optional): Device to run inference on ('cuda' or 'cpu')
+            use_int8 (bool, optional): Dynamically quantize Linear layers to int8 (CPU only)
+            use_compile (bool, optional): Compile the model with torch.compile (TorchScript on older PyTorch)
+            cache_size (int, optional): Number of results kept in the content-hash cache (0 disables it)
+            staging_buffers (int, optional): Pinned host-to-device staging buffers (CUDA only)
         """
         self.model_path = model_path
         self.class_map_path = class_map_path
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        # Half precision lets Tensor Cores engage on GPU; CPU stays in FP32
+        self.dtype = torch.float16 if self.device == "cuda" else torch.float32
+        self.use_int8 = use_int8
+        self.use_compile = use_compile
+        self.compiled = False
+        self._eager_model = None
+        self.batch_buckets = batch_buckets()
+        
+        # Results keyed by a hash of the uploaded bytes, in LRU order
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Pool of (pinned host buffer, device buffer, copy-done event) reused for uploads,
+        # and a side stream so copies overlap with inference on the default stream
+        self.staging_buffers = staging_buffers
+        self._staging = None
+        self._copy_stream = None
+        
         self.model = None
         self.class_map = None
+        self._idx_to_class = None
         self.transform = None
         
-        # Initialize the predictor
-        self._load_model()
+        # Initialize the predictor (the class map sizes the classifier head)
         self._load_class_map()
+        self._load_model()
         self._setup_transforms()
         
         logger.info(f"ElectricalComponentPredictor initialized on device: {self.device}")
@@ -53,10 +125,7 @@ class ElectricalComponentPredictor:
             if not os.path.exists(self.model_path):
                 raise FileNotFoundError(f"Model file not found: {self.model_path}")
             
-            # Load class mapping to get number of classes
-            with open(self.class_map_path, 'r') as f:
-                class_map = json.load(f)
-            num_classes = len(class_map)
+            num_classes = len(self.class_map)
             
             # Create model architecture (matching training script)
             model = models.resnet50(weights=None)  # Don't load pretrained weights
@@ -72,16 +141,50 @@ class ElectricalComponentPredictor:
             
             # Load trained weights
             model.load_state_dict(torch.load(self.model_path, map_location=self.device))
-            model.to(self.device)
+            # NHWC layout maps onto cuDNN/oneDNN convolution kernels without transposes
+            model = model.to(self.device, dtype=self.dtype, memory_format=torch.channels_last)
             model.eval()
             
+            # Inference only: never track gradients for the weights
+            for param in model.parameters():
+                param.requires_grad_(False)
+            
+            # int8 dynamic quantization of the classifier head (CPU kernels only)
+            if self.use_int8:
+                if self.device == "cpu":
+                    model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+                    logger.info("Linear layers quantized to int8")
+                else:
+                    logger.warning("int8 quantization is only supported on CPU, skipping")
+            
             self.model = model
+            self._eager_model = model
+            if self.use_compile:
+                self._compile_model()
+            
             logger.info("Model loaded successfully")
             
         except Exception as e:
             logger.error(f"Error loading model: {str(e)}")
             raise
     
+    def _compile_model(self) -> None:
+        """Compile the model into fused kernels, keeping the eager model on failure."""
+        try:
+            if hasattr(torch, 'compile'):
+                # Compilation is lazy; warmup() triggers it for every batch bucket
+                self.model = torch.compile(self.model, mode="reduce-overhead", fullgraph=True)
+                logger.info("Model compiled with torch.compile")
+            else:
+                example = self._dummy_batch(1)
+                traced = torch.jit.trace(self.model, example)
+                self.model = torch.jit.optimize_for_inference(traced)
+                logger.info("Model compiled with TorchScript")
+            self.compiled = True
+        except Exception as e:
+            logger.warning(f"Model compilation failed, using eager model: {str(e)}")
+            self.model = self._eager_model
+    
     def _load_class_map(self) -> None:
         """Load the class mapping from JSON file."""
         try:
@@ -91,6 +194,9 @@ class ElectricalComponentPredictor:
             with open(self.class_map_path, 'r') as f:
                 self.class_map = json.load(f)
             
+            # Flat index -> class name lookup, ordered by model output index
+            self._idx_to_class = [self.class_map[str(i)] for i in range(len(self.class_map))]
+            
             logger.info(f"Class map loaded with {len(self.class_map)} classes")
             
         except Exception as e:
@@ -99,12 +205,195 @@ class ElectricalComponentPredictor:
     
     def _setup_transforms(self) -> None:
         """Setup image preprocessing transforms."""
-        self.transform = transforms.Compose([
-            transforms.Resize((128, 256)),
-            transforms.ToTensor(),
-            transforms.Normalize([0.485, 0.456, 0.406], [0.229, 0.224, 0.225])
+        # Produces a resized uint8 CHW tensor; normalization happens on device
+        self.transform = v2.Compose([
+            v2.ToImage(),
+            v2.Resize(INPUT_SIZE, antialias=True)
         ])
-        logger.info("Image transforms configured")
+        
+        # Statistics in 0-255 pixel units, pre-broadcast and cached on the device
+        self._mean = (torch.tensor(NORMALIZE_MEAN) * 255).view(1, 3, 1, 1).to(self.device, self.dtype)
+        self._std = (torch.tensor(NORMALIZE_STD) * 255).view(1, 3, 1, 1).to(self.device, self.dtype)
+        
+        if self.device == "cuda" and self.staging_buffers > 0:
+            self._staging = queue.Queue()
+            for _ in range(self.staging_buffers):
+                cpu_buf = torch.empty((1, 3, *INPUT_SIZE), dtype=torch.uint8, pin_memory=True,
+                                      memory_format=torch.channels_last)
+                gpu_buf = torch.empty_like(cpu_buf, device=self.device)
+                self._staging.put((cpu_buf, gpu_buf, torch.cuda.Event()))
+            self._copy_stream = torch.cuda.Stream()
+        
+        logger.info(f"Image transforms configured (OpenCV fast path: {'enabled' if cv2 is not None else 'disabled'})")
+    
+    def _dummy_batch(self, batch_size: int) -> torch.Tensor:
+        """Create a zero input batch matching the model's device, dtype and memory format."""
+        return torch.zeros(batch_size, 3, *INPUT_SIZE, device=self.device, dtype=self.dtype).to(
+            memory_format=torch.channels_last)
+    
+    def _pads_batches(self) -> bool:
+        """
+        Whether batches are padded to self.batch_buckets.
+        
+        Compiled graphs and cuDNN benchmark autotuning are both specialized
+        per input shape, so a fixed set of batch sizes keeps that work in warmup.
+        """
+        return self.compiled or self.device == "cuda"
+    
+    def _warm_batch_sizes(self) -> None:
+        """Run a forward pass for every batch size predict_batch() can send to the model."""
+        batch_sizes = self.batch_buckets if self._pads_batches() else (1,)
+        with torch.inference_mode():
+            for batch_size in batch_sizes:
+                self.model(self._dummy_batch(batch_size))
+    
+    def warmup(self, batch_sizes: Tuple[int, ...] = None) -> None:
+        """
+        Run dummy forward passes so the first real request does not pay for
+        CUDA context creation, cuDNN algorithm selection or model compilation.
+        
+        Args:
+            batch_sizes (Tuple[int, ...], optional): Buckets predict_batch() pads to,
+                from batch_buckets(); the largest must be the batcher's max_batch_size
+        """
+        if batch_sizes is not None:
+            self.batch_buckets = tuple(sorted(batch_sizes))
+        
+        if self.device == "cuda":
+            torch.backends.cudnn.benchmark = True
+        
+        try:
+            self._warm_batch_sizes()
+        except Exception as e:
+            if not self.compiled:
+                raise
+            logger.warning(f"Compiled model failed during warmup, using eager model: {str(e)}")
+            self.model = self._eager_model
+            self.compiled = False
+            self._warm_batch_sizes()
+        
+        logger.info("Model warmup completed")
+    
+    def _decodes_on_gpu(self, data: bytes) -> bool:
+        """Whether the image is a JPEG that nvJPEG can decode directly on the GPU."""
+        return self.device == "cuda" and data[:2] == b'\xff\xd8'
+    
+    def _decode_resize_cv2(self, data: bytes) -> Optional[torch.Tensor]:
+        """
+        Decode and resize image bytes with OpenCV SIMD kernels on uint8 data.
+        
+        Args:
+            data (bytes): Encoded image file contents
+            
+        Returns:
+            torch.Tensor: Resized uint8 CHW tensor, or None if OpenCV cannot decode the format
+        """
+        # PIL and torchvision.io ignore EXIF orientation, and so did training; match them
+        image = cv2.imdecode(np.frombuffer(data, np.uint8),
+                             cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION)
+        if image is None:
+            return None
+        
+        height, width = INPUT_SIZE
+        # INTER_AREA antialiases when shrinking, like the PIL resize used in training
+        shrinking = image.shape[0] >= height and image.shape[1] >= width
+        image = cv2.resize(image, (width, height),
+                           interpolation=cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR)
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        
+        # HWC -> CHW view; the underlying memory is already channels_last
+        return torch.from_numpy(image).permute(2, 0, 1)
+    
+    def _to_device_staged(self, image: torch.Tensor) -> torch.Tensor:
+        """
+        Copy a resized uint8 CPU image to the GPU through a pinned staging buffer
+        and normalize it there.
+        
+        The copy, cast and normalization run on a side stream, so they overlap
+        with a forward pass already queued on the default stream. Work queued
+        on the caller's stream afterwards waits for them. Blocks until a
+        staging buffer is free when all of them are in use.
+        
+        Args:
+            image (torch.Tensor): Resized uint8 CHW tensor on the CPU
+            
+        Returns:
+            torch.Tensor: Normalized [1, 3, H, W] tensor on self.device in self.dtype
+        """
+        consumer = torch.cuda.current_stream()
+        cpu_buf, gpu_buf, copied = self._staging.get()
+        try:
+            # The previous asynchronous copy out of this host buffer must finish first
+            copied.synchronize()
+            cpu_buf[0].copy_(image)
+            with torch.cuda.stream(self._copy_stream):
+                gpu_buf.copy_(cpu_buf, non_blocking=True)
+                # Casting reads the device buffer into a fresh tensor, freeing it for reuse
+                staged = gpu_buf.to(self.dtype).sub_(self._mean).div_(self._std)
+                copied.record()
+        finally:
+            self._staging.put((cpu_buf, gpu_buf, copied))
+        
+        consumer.wait_stream(self._copy_stream)
+        # Keep the allocator from reusing this memory while the consumer stream reads it
+        staged.record_stream(consumer)
+        return staged
+    
+    def _decode_image(self, data: bytes):
+        """
+        Decode encoded image bytes to RGB, avoiding PIL where torchvision.io can.
+        
+        JPEG and PNG are decoded by torchvision.io into a uint8 CHW tensor
+        (JPEG on the GPU when running on CUDA). Other formats fall back to PIL.
+        
+        Args:
+            data (bytes): Encoded image file contents
+            
+        Returns:
+            torch.Tensor or PIL.Image.Image: Decoded RGB image
+        """
+        try:
+            encoded = torch.frombuffer(bytearray(data), dtype=torch.uint8)
+            if self._decodes_on_gpu(data):
+                return decode_jpeg(encoded, mode=ImageReadMode.RGB, device=self.device)
+            return decode_image(encoded, mode=ImageReadMode.RGB)
+        except RuntimeError:
+            # Format not supported by torchvision.io (e.g. GIF, BMP, TIFF, WEBP)
+            return Image.open(io.BytesIO(data)).convert('RGB')
+    
+    def preprocess_bytes(self, data: bytes) -> Optional[torch.Tensor]:
+        """
+        Preprocess in-memory image bytes for prediction.
+        
+        Args:
+            data (bytes): Encoded image file contents
+            
+        Returns:
+            torch.Tensor: Preprocessed image tensor or None if error
+        """
+        try:
+            image_tensor = None
+            if cv2 is not None and not self._decodes_on_gpu(data):
+                image_tensor = self._decode_resize_cv2(data)
+            
+            if image_tensor is None:
+                # Decode straight to a uint8 RGB tensor and resize
+                image = self._decode_image(data)
+                image_tensor = self.transform(image)
+            
+            # Transfer uint8 pixels (a quarter of the FP32 bytes), then normalize in place on device
+            if self._staging is not None and image_tensor.device.type == "cpu":
+                image_tensor = self._to_device_staged(image_tensor)
+            else:
+                image_tensor = image_tensor.unsqueeze(0).to(self.device, memory_format=torch.channels_last)
+                image_tensor = image_tensor.to(self.dtype).sub_(self._mean).div_(self._std)
+            
+            logger.info(f"Image preprocessed successfully ({len(data)} bytes)")
+            return image_tensor
+            
+        except Exception as e:
+            logger.error(f"Error preprocessing image: {str(e)}")
+            return None
     
     def preprocess_image(self, image_path: str) -> Optional[torch.Tensor]:
         """
@@ -122,18 +411,84 @@ class ElectricalComponentPredictor:
                 logger.error(f"Image file not found: {image_path}")
                 return None
             
-            # Open and convert image
-            image = Image.open(image_path).convert('RGB')
-            
-            # Apply transforms
-            image_tensor = self.transform(image).unsqueeze(0).to(self.device)
-            
-            logger.info(f"Image preprocessed successfully: {image_path}")
-            return image_tensor
+            with open(image_path, 'rb') as f:
+                data = f.read()
             
         except Exception as e:
-            logger.error(f"Error preprocessing image {image_path}: {str(e)}")
+            logger.error(f"Error reading image {image_path}: {str(e)}")
             return None
+        
+        return self.preprocess_bytes(data)
+    
+    @staticmethod
+    def error_result(message: str) -> Dict[str, Any]:
+        """
+        Build the result returned when a prediction cannot be made.
+        
+        Args:
+            message (str): Description of the failure
+            
+        Returns:
+            Dict[str, Any]: Unsuccessful prediction result
+        """
+        return {
+            'success': False,
+            'error': message,
+            'class_name': None,
+            'confidence': 0.0,
+            'probabilities': {}
+        }
+    
+    def predict_batch(self, image_tensors: torch.Tensor) -> List[Dict[str, Any]]:
+        """
+        Make predictions on a batch of preprocessed images in one forward pass.
+        
+        Args:
+            image_tensors (torch.Tensor): Batch of shape [B, 3, 128, 256] on self.device, in self.dtype
+            
+        Returns:
+            List[Dict[str, Any]]: One prediction result per image, in batch order
+        """
+        batch_size = image_tensors.shape[0]
+        if self._pads_batches():
+            # Pad to a warmed bucket so no compilation or autotuning happens on the request path
+            padded_size = next((b for b in self.batch_buckets if b >= batch_size), batch_size)
+            if padded_size > batch_size:
+                padding = image_tensors.new_zeros(padded_size - batch_size, *image_tensors.shape[1:])
+                image_tensors = torch.cat([image_tensors, padding])
+        
+        # Concatenation does not guarantee NHWC strides for the batch
+        image_tensors = image_tensors.contiguous(memory_format=torch.channels_last)
+        
+        with torch.inference_mode():
+            outputs = self.model(image_tensors)[:batch_size]
+            probabilities = torch.nn.functional.softmax(outputs.float(), dim=1)
+        
+        # Single device-to-host transfer for the whole batch
+        probs_batch = probabilities.cpu().numpy()
+        top_k = min(5, probs_batch.shape[1])
+        
+        results = []
+        for probs in probs_batch:
+            # Top 5 predictions, highest first
+            top_idx = np.argpartition(-probs, top_k - 1)[:top_k]
+            top_idx = top_idx[np.argsort(-probs[top_idx])]
+            top_probs = {self._idx_to_class[idx]: float(probs[idx]) for idx in top_idx}
+            
+            predicted_class = self._idx_to_class[top_idx[0]]
+            confidence_score = float(probs[top_idx[0]])
+            
+            results.append({
+                'success': True,
+                'class_name': predicted_class,
+                'confidence': confidence_score,
+                'probabilities': top_probs,
+                'all_probabilities': dict(zip(self._idx_to_class, probs.tolist()))
+            })
+            
+            logger.info(f"Prediction successful: {predicted_class} (confidence: {confidence_score:.4f})")
+        
+        return results
     
     def predict(self, image_path: str) -> Dict[str, Any]:
         """
@@ -149,51 +504,103 @@ class ElectricalComponentPredictor:
             # Preprocess image
             image_tensor = self.preprocess_image(image_path)
             if image_tensor is None:
-                return {
-                    'success': False,
-                    'error': 'Failed to preprocess image',
-                    'class_name': None,
-                    'confidence': 0.0,
-                    'probabilities': {}
-                }
-            
-            # Make prediction
-            with torch.no_grad():
-                outputs = self.model(image_tensor)
-                probabilities = torch.nn.functional.softmax(outputs, dim=1)
-                confidence, predicted_idx = torch.max(probabilities, 1)
-            
-            # Get class name and create probability mapping
-            predicted_class = self.class_map[str(predicted_idx.item())]
-            confidence_score = confidence.item()
-            
-            # Create probability distribution for all classes
-            prob_dist = {}
-            for idx, class_name in self.class_map.items():
-                prob_dist[class_name] = probabilities[0][int(idx)].item()
-            
-            # Sort probabilities for better display
-            sorted_probs = sorted(prob_dist.items(), key=lambda x: x[1], reverse=True)
-            
-            result = {
-                'success': True,
-                'class_name': predicted_class,
-                'confidence': confidence_score,
-                'probabilities': dict(sorted_probs[:5]),  # Top 5 predictions
-                'all_probabilities': prob_dist
-            }
+                return self.error_result('Failed to preprocess image')
             
-            logger.info(f"Prediction successful: {predicted_class} (confidence: {confidence_score:.4f})")
+            return self.predict_batch(image_tensor)[0]
+            
+        except Exception as e:
+            logger.error(f"Error during prediction: {str(e)}")
+            return self.error_result(str(e))
+    
+    def predict_bytes(self, data: bytes) -> Dict[str, Any]:
+        """
+        Make a prediction on in-memory image bytes, without touching disk.
+        
+        Args:
+            data (bytes): Encoded image file contents
+            
+        Returns:
+            Dict[str, Any]: Prediction results with class name, confidence, and probabilities
+        """
+        try:
+            key = self.content_key(data)
+            cached = self.get_cached(key)
+            if cached is not None:
+                return cached
+            
+            image_tensor = self.preprocess_bytes(data)
+            if image_tensor is None:
+                return self.error_result('Failed to preprocess image')
+            
+            result = self.predict_batch(image_tensor)[0]
+            self.put_cached(key, result)
             return result
             
         except Exception as e:
             logger.error(f"Error during prediction: {str(e)}")
+            return self.error_result(str(e))
+    
+    @staticmethod
+    def content_key(data: bytes) -> bytes:
+        """
+        Hash image bytes into a prediction cache key.
+        
+        Args:
+            data (bytes): Encoded image file contents
+            
+        Returns:
+            bytes: 16-byte BLAKE2b digest
+        """
+        return hashlib.blake2b(data, digest_size=16).digest()
+    
+    def get_cached(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached prediction result.
+        
+        Args:
+            key (bytes): Key from content_key()
+            
+        Returns:
+            Dict[str, Any]: Copy of the cached result, or None on a miss
+        """
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is None:
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+        return dict(result)
+    
+    def put_cached(self, key: bytes, result: Dict[str, Any]) -> None:
+        """
+        Store a successful prediction result, evicting the least recently used entry.
+        
+        Args:
+            key (bytes): Key from content_key()
+            result (Dict[str, Any]): Prediction result
+        """
+        if self.cache_size <= 0 or not result.get('success'):
+            return
+        with self._cache_lock:
+            self._cache[key] = dict(result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Get prediction cache statistics.
+        
+        Returns:
+            Dict[str, int]: Cache hits, misses, current size and capacity
+        """
+        with self._cache_lock:
             return {
-                'success': False,
-                'error': str(e),
-                'class_name': None,
-                'confidence': 0.0,
-                'probabilities': {}
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'size': len(self._cache),
+                'max_size': self.cache_size
             }
     
     def get_class_info(self) -> Dict[str, Any]:
@@ -205,15 +612,214 @@ class ElectricalComponentPredictor:
         """
         return {
             'num_classes': len(self.class_map),
-            'classes': list(self.class_map.values()),
+            'classes': list(self._idx_to_class),
             'class_mapping': self.class_map
         }
 
 
+class DynamicBatcher:
+    """
+    Dynamic request batcher for the predictor.
+    
+    Concurrent requests submit image bytes (or preprocessed tensors) and
+    receive a Future. Decoding and preprocessing run on a small thread pool
+    so they overlap with inference. A background thread collects
+    preprocessed requests until either max_batch_size images are queued or
+    max_latency seconds have passed since the first one arrived, then runs
+    a single forward pass for the whole batch.
+    """
+    
+    def __init__(self, predictor: ElectricalComponentPredictor,
+                 max_batch_size: int = MAX_BATCH_SIZE, max_latency: float = 0.02,
+                 preprocess_workers: int = 4):
+        """
+        Initialize the batcher and start its worker thread.
+        
+        Args:
+            predictor (ElectricalComponentPredictor): Predictor used for inference
+            max_batch_size (int): Maximum number of images per forward pass
+            max_latency (float): Maximum time in seconds a request waits for a batch to fill
+            preprocess_workers (int): Threads decoding and preprocessing uploads
+        """
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self._queue = queue.Queue()
+        self._pp_pool = ThreadPoolExecutor(max_workers=preprocess_workers,
+                                           thread_name_prefix="preprocess")
+        
+        self._worker = threading.Thread(target=self._run, name="prediction-batcher", daemon=True)
+        self._worker.start()
+        
+        logger.info(f"DynamicBatcher started (max_batch_size={max_batch_size}, max_latency={max_latency}s)")
+    
+    def submit(self, image_tensor: torch.Tensor) -> Future:
+        """
+        Queue a preprocessed image for prediction.
+        
+        Args:
+            image_tensor (torch.Tensor): Image tensor of shape [1, 3, 128, 256]
+            
+        Returns:
+            Future: Resolves to the prediction result dict
+        """
+        future = Future()
+        # Running futures cannot be cancelled, so the batching thread can always resolve them
+        future.set_running_or_notify_cancel()
+        self._queue.put((image_tensor, future))
+        return future
+    
+    def submit_bytes(self, data: bytes) -> Future:
+        """
+        Queue encoded image bytes for preprocessing and prediction.
+        
+        Args:
+            data (bytes): Encoded image file contents
+            
+        Returns:
+            Future: Resolves to the prediction result dict
+        """
+        future = Future()
+        self._pp_pool.submit(self._preprocess_and_queue, data, future)
+        return future
+    
+    def _preprocess_and_queue(self, data: bytes, future: Future) -> None:
+        """Preprocess on a pool thread, then hand the tensor to the batching thread."""
+        # Skip requests cancelled while waiting for a pool thread; afterwards they cannot be cancelled
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            image_tensor = self.predictor.preprocess_bytes(data)
+        except Exception as e:
+            self._resolve(future, exception=e)
+            return
+        if image_tensor is None:
+            self._resolve(future, result=self.predictor.error_result('Failed to preprocess image'))
+            return
+        self._queue.put((image_tensor, future))
+    
+    @staticmethod
+    def _resolve(future: Future, result: Any = None, exception: Exception = None) -> None:
+        """Set a future's outcome, ignoring futures that are already resolved."""
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            logger.warning("Dropping result for a prediction that was already resolved")
+    
+    def predict_bytes(self, data: bytes, timeout: float = None) -> Dict[str, Any]:
+        """
+        Make a batched prediction on in-memory image bytes.
+        
+        Mirrors ElectricalComponentPredictor.predict_bytes, including the
+        content-hash cache, but shares the forward pass with concurrent requests.
+        
+        Args:
+            data (bytes): Encoded image file contents
+            timeout (float, optional): Seconds to wait for the batch result
+            
+        Returns:
+            Dict[str, Any]: Prediction results with class name, confidence, and probabilities
+            
+        Raises:
+            concurrent.futures.TimeoutError: If the result is not ready within timeout
+        """
+        key = self.predictor.content_key(data)
+        cached = self.predictor.get_cached(key)
+        if cached is not None:
+            return cached
+        
+        future = self.submit_bytes(data)
+        try:
+            result = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Drop the request if it is still waiting for a preprocess thread
+            future.cancel()
+            raise
+        self.predictor.put_cached(key, result)
+        return result
+    
+    async def predict_bytes_async(self, data: bytes, timeout: float = None) -> Dict[str, Any]:
+        """
+        Make a batched prediction on in-memory image bytes from async code.
+        
+        Same as predict_bytes, but awaits the batch result instead of
+        blocking a thread, so an event loop can hold many requests in flight.
+        
+        Args:
+            data (bytes): Encoded image file contents
+            timeout (float, optional): Seconds to wait for the batch result
+            
+        Returns:
+            Dict[str, Any]: Prediction results with class name, confidence, and probabilities
+            
+        Raises:
+            asyncio.TimeoutError: If the result is not ready within timeout
+        """
+        # Hashing a large upload would stall the event loop, so it runs on the preprocess pool
+        key = await asyncio.get_running_loop().run_in_executor(self._pp_pool, self.predictor.content_key, data)
+        cached = self.predictor.get_cached(key)
+        if cached is not None:
+            return cached
+        
+        future = self.submit_bytes(data)
+        try:
+            # Shielded so only the explicit cancel below reaches the batch future
+            result = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            # Drop the request if it is still waiting for a preprocess thread
+            future.cancel()
+            raise
+        self.predictor.put_cached(key, result)
+        return result
+    
+    def _collect(self) -> List[Tuple[torch.Tensor, Future]]:
+        """Block for the first request, then gather more until the batch is full or the deadline passes."""
+        items = [self._queue.get()]
+        deadline = time.monotonic() + self.max_latency
+        
+        while len(items) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        return items
+    
+    def _run(self) -> None:
+        """Worker loop: batch pending requests and resolve their futures."""
+        while True:
+            items = [(tensor, future) for tensor, future in self._collect() if not future.done()]
+            if not items:
+                continue
+            tensors = [tensor for tensor, _ in items]
+            futures = [future for _, future in items]
+            
+            try:
+                results = self.predictor.predict_batch(torch.cat(tensors))
+            except Exception as e:
+                logger.error(f"Error during batched prediction: {str(e)}")
+                for future in futures:
+                    self._resolve(future, exception=e)
+                continue
+            
+            for future, result in zip(futures, results):
+                self._resolve(future, result=result)
+
+
 def create_predictor(model_path: str = None, class_map_path: str = None) -> ElectricalComponentPredictor:
     """
     Factory function to create a predictor instance.
     
+    Setting the USE_INT8 environment variable to 1 enables int8 quantization
+    of the classifier head on CPU deployments, and USE_COMPILE=1 compiles the
+    model into fused kernels at startup.
+    
     Args:
         model_path (str, optional): Path to model file
         class_map_path (str, optional): Path to class map file
@@ -227,7 +833,11 @@ def create_predictor(model_path: str = None, class_map_path: str = None) -> Elec
     if class_map_path is None:
         class_map_path = os.path.join(os.path.dirname(__file__), '..', 'model', 'class_map.json')
     
-    return ElectricalComponentPredictor(model_path, class_map_path)
+    use_int8 = os.environ.get('USE_INT8', '0').lower() in ('1', 'true', 'yes')
+    use_compile = os.environ.get('USE_COMPILE', '0').lower() in ('1', 'true', 'yes')
+    
+    return ElectricalComponentPredictor(model_path, class_map_path,
+                                        use_int8=use_int8, use_compile=use_compile)
 
 
 # Example usage and testing
@@ -13,9 +13,11 @@ def check_requirements():
     """Check if all requirements are installed."""
     try:
         import flask
+        import waitress
         import torch
         import torchvision
         from PIL import Image
+        import streaming_form_data
         print("✅ All required packages are installed")
         return True
     except ImportError as e:
@@ -79,19 +81,14 @@ def main():
         # Import and run the Flask app
         import sys
         sys.path.append('.')
-        from app import app
+        from app import run_server
         print("✅ Application loaded successfully")
         print("🌐 Server starting at: http://localhost:5000")
         print("📱 Open your browser and navigate to the URL above")
         print("\nPress Ctrl+C to stop the server")
         print("=" * 50)
         
-        app.run(
-            host='127.0.0.1',
-            port=5000,
-            debug=False,
-            threaded=True
-        )
+        run_server(host='127.0.0.1', port=5000)
     except KeyboardInterrupt:
         print("\n\n👋 Server stopped by user")
     except Exception as e:
@@ -26,7 +26,7 @@ def main():
     # Add current directory to Python path
     sys.path.insert(0, str(backend_dir))
     
-    print("✅ Starting Flask application...")
+    print("✅ Starting Flask application with Waitress...")
     print("🌐 Server will start at: http://localhost:5000")
     print("📱 Open your browser and navigate to the URL above")
     print("\nPress Ctrl+C to stop the server")
@@ -34,13 +34,8 @@ def main():
     
     try:
         # Import and run the Flask app
-        from app import app
-        app.run(
-            host='0.0.0.0',
-            port=5000,
-            debug=True,
-            threaded=True
-        )
+        from app import run_server
+        run_server(host='0.0.0.0', port=5000)
     except KeyboardInterrupt:
         print("\n\n👋 Server stopped by user")
     except Exception as e:
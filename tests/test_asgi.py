@@ -0,0 +1,115 @@
+"""
+Electrical Component Classifier - ASGI front end tests
+Exercise backend/asgi.py with a stand-in predictor so no model weights are needed.
+"""
+
+import asyncio
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+RESULT = {
+    'success': True,
+    'class_name': 'resistor',
+    'confidence': 0.9,
+    'probabilities': {'resistor': 0.9},
+    'all_probabilities': {'resistor': 0.9}
+}
+
+class FakePredictor:
+    """Predictor stand-in exposing what the routes read."""
+    
+    def warmup(self, batch_sizes=None):
+        pass
+    
+    def get_class_info(self):
+        return {'num_classes': 1, 'classes': ['resistor'], 'class_mapping': {'0': 'resistor'}}
+    
+    def get_cache_stats(self):
+        return {'size': 0, 'hits': 0, 'misses': 0}
+
+class FakeBatcher:
+    """Batcher stand-in that answers after delay seconds."""
+    
+    delay = 0
+    
+    def __init__(self, predictor, **kwargs):
+        self.predictor = predictor
+    
+    def predict_bytes(self, data, timeout=None):
+        return dict(RESULT)
+    
+    async def predict_bytes_async(self, data, timeout=None):
+        await asyncio.wait_for(asyncio.sleep(self.delay), timeout)
+        return dict(RESULT)
+
+# app.py builds its predictor at import time, so the real dep module must never load
+fake_dep = types.ModuleType('dep')
+fake_dep.batch_buckets = lambda max_batch_size: (max_batch_size,)
+fake_dep.create_predictor = FakePredictor
+fake_dep.DynamicBatcher = FakeBatcher
+sys.modules['dep'] = fake_dep
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app as flask_module  # noqa: E402
+import asgi  # noqa: E402
+
+@pytest.fixture
+def client():
+    with TestClient(asgi.app) as client:
+        yield client
+
+def upload(name='board.jpg', data=b'\xff\xd8image'):
+    return {'file': (name, data, 'image/jpeg')}
+
+def test_health(client):
+    response = client.get('/health')
+    assert response.status_code == 200
+    assert response.json()['status'] == 'healthy'
+
+def test_predict(client):
+    response = client.post('/predict', files=upload())
+    assert response.status_code == 200
+    body = response.json()
+    assert body['class_name'] == 'resistor'
+    assert 'all_probabilities' not in body
+
+def test_predict_rejects_bad_extension(client):
+    response = client.post('/predict', files=upload(name='notes.txt'))
+    assert response.status_code == 400
+
+def test_predict_timeout(client, monkeypatch):
+    monkeypatch.setitem(flask_module.app.config, 'PREDICT_TIMEOUT', 0.01)
+    monkeypatch.setattr(FakeBatcher, 'delay', 1)
+    response = client.post('/predict', files=upload())
+    assert response.status_code == 503
+
+def test_predict_rejects_oversized_content_length(client, monkeypatch):
+    monkeypatch.setitem(flask_module.app.config, 'MAX_CONTENT_LENGTH', 1024)
+    response = client.post('/predict', files=upload(data=b'x' * 2048))
+    assert response.status_code == 413
+    assert response.json()['success'] is False
+
+def test_predict_rejects_oversized_chunked_upload(client, monkeypatch):
+    monkeypatch.setitem(flask_module.app.config, 'MAX_CONTENT_LENGTH', 1024)
+    
+    def body():
+        # No Content-Length: the limit can only be enforced while receiving
+        yield b'--boundary\r\nContent-Disposition: form-data; name="file"; filename="board.jpg"\r\n\r\n'
+        for _ in range(4):
+            yield b'x' * 1024
+        yield b'\r\n--boundary--\r\n'
+    
+    response = client.post('/predict', content=body(),
+                           headers={'Content-Type': 'multipart/form-data; boundary=boundary'})
+    assert response.status_code == 413
+
+def test_pages_served_by_flask(client):
+    response = client.get('/documentation')
+    assert response.status_code == 200
+    assert 'text/html' in response.headers['content-type']